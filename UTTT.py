@@ -2,6 +2,8 @@ import time
 import platform
 import smtplib
 import csv
+import heapq
+from array import array
 from email.message import EmailMessage
 
 # Safe beep wrapper
@@ -331,6 +333,123 @@ def compare_players(players):
     print(f"  {p1.name}: {round(expected1 * 100, 2)}%")
     print(f"  {p2.name}: {round(expected2 * 100, 2)}%")
 
+# 🧮 All-pairs expected score matrix
+class ExpectedScoreMatrix:
+    def __init__(self, players, names=None, upper_only=False):
+        # names=None follows the whole roster; otherwise only the given subset
+        self.players = players
+        self.follow_roster = names is None
+        self.upper_only = upper_only
+        self.rebuild(names)
+
+    def rebuild(self, names=None):
+        if names is None:
+            names = list(self.players) if self.follow_roster else [p.name for p in self._members]
+        self._members = [self.players[name] for name in names if name in self.players]
+        self.names = [p.name for p in self._members]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self._ratings = [p.rating for p in self._members]
+        # E(a, b) == 1 / (1 + 10 ** ((Rb - Ra) / 400)) == Qa / (Qa + Qb)
+        self._q = [10 ** (r / 400) for r in self._ratings]
+        n = len(self._members)
+        size = n * (n - 1) // 2 if self.upper_only else n * n
+        self.data = array('f', bytes(4 * size))
+        for i in range(n):
+            self._fill_row(i)
+
+    def _row_offset(self, i):
+        n = len(self._members)
+        return i * (2 * n - i - 1) // 2
+
+    def _fill_row(self, i):
+        q = self._q
+        qi = q[i]
+        n = len(q)
+        if self.upper_only:
+            off = self._row_offset(i)
+            self.data[off:off + n - i - 1] = array('f', [qi / (qi + qj) for qj in q[i + 1:]])
+        else:
+            self.data[i * n:(i + 1) * n] = array('f', [qi / (qi + qj) for qj in q])
+
+    def _fill_column(self, i):
+        q = self._q
+        qi = q[i]
+        n = len(q)
+        data = self.data
+        if self.upper_only:
+            for j in range(i):
+                data[self._row_offset(j) + i - j - 1] = q[j] / (q[j] + qi)
+        else:
+            for j in range(n):
+                data[j * n + i] = q[j] / (q[j] + qi)
+
+    def refresh(self):
+        members = self._members
+        roster_changed = any(self.players.get(p.name) is not p for p in members)
+        if self.follow_roster and len(self.players) != len(members):
+            roster_changed = True
+        if roster_changed or any(p.name != name for p, name in zip(members, self.names)):
+            self.rebuild()
+            return len(self._members)
+
+        changed = [i for i, p in enumerate(members) if p.rating != self._ratings[i]]
+        for i in changed:
+            self._ratings[i] = members[i].rating
+            self._q[i] = 10 ** (members[i].rating / 400)
+        # Rows and columns of changed players are rewritten after all Q values
+        # are current, so pairs of two changed players end up consistent.
+        for i in changed:
+            self._fill_row(i)
+            self._fill_column(i)
+        return len(changed)
+
+    def _lookup(self, i, j):
+        if i == j:
+            return 0.5
+        if self.upper_only:
+            if i < j:
+                return self.data[self._row_offset(i) + j - i - 1]
+            return 1 - self.data[self._row_offset(j) + i - j - 1]
+        return self.data[i * len(self._members) + j]
+
+    def expected(self, name_a, name_b):
+        return self._lookup(self.index[name_a], self.index[name_b])
+
+    def row(self, name):
+        i = self.index[name]
+        n = len(self._members)
+        if not self.upper_only:
+            return list(self.data[i * n:(i + 1) * n])
+        return [self._lookup(i, j) for j in range(n)]
+
+    def most_even_opponents(self, name, n=5):
+        scores = self.row(name)
+        i = self.index[name]
+        candidates = ((abs(score - 0.5), self.names[j], score) for j, score in enumerate(scores) if j != i)
+        return [(opponent, score) for _, opponent, score in heapq.nsmallest(n, candidates)]
+
+# 🤝 Show most even opponents for a player
+def show_most_even_opponents(players, matrix):
+    if len(players) < 2:
+        print("❌ You need at least two players to compare.")
+        return
+    name = input("Enter player name: ")
+    if name not in players:
+        print("❌ Player not found.")
+        return
+    try:
+        count = int(input("How many opponents to show? (or press Enter for 5): ") or 5)
+        if count < 1:
+            raise ValueError
+    except ValueError:
+        print("❌ Invalid number. Try again.")
+        return
+
+    matrix.refresh()
+    print(f"\n🤝 Most even opponents for {name}:")
+    for i, (opponent, expected) in enumerate(matrix.most_even_opponents(name, count), start=1):
+        print(f"{i}. {opponent}: {round(players[opponent].rating)} - {name} expected {round(expected * 100, 2)}%")
+
 # --- Ultimate Tic-Tac-Toe Game Logic ---
 
 class SubBoard:
@@ -541,6 +660,7 @@ def main():
     redo_stack = []
     rename_history = []
     rename_redo = []
+    prediction_matrix = ExpectedScoreMatrix(players)
 
     while True:
         print("\n--- Main Menu ---")
@@ -559,6 +679,7 @@ def main():
         print("13. Redo Last Match")
         print("14. Rename Player")
         print("15. Undo Rename Player")
+        print("17. Show Most Even Opponents")
         print("16. Exit")
 
         choice = input("Enter your choice: ")
@@ -659,6 +780,9 @@ def main():
             print("👋 Thanks for using our Ultimate Tic Tac Toe Elo rating system!")
             break
 
+        elif choice == "17":
+            show_most_even_opponents(players, prediction_matrix)
+
         else:
             print("❌ Invalid choice. Try again.")
 